@@ -5,15 +5,24 @@ Creates larger files suitable for testing size-based chunking.
 
 import os
 import random
-from reportlab.lib.pagesizes import letter
-from reportlab.pdfgen import canvas
-from reportlab.lib.utils import ImageReader
+from concurrent.futures import ProcessPoolExecutor
 from io import BytesIO
-from PIL import Image
+
+# numpy, PIL, and reportlab are imported inside the functions that use them:
+# they cost hundreds of ms to load, which matters for --help and imports.
 
 
 OUTPUT_DIR = os.path.join(os.path.dirname(__file__), "test_pdfs")
 
+# Fast zlib effort for throwaway fixtures; ~10-15% larger PNGs but much faster.
+TEST_PNG_COMPRESS_LEVEL = 1
+
+# Rows per strip when filling an image: 256 rows of int16 RGB at the widest
+# page (~3000 px) is ~4.5 MB, small enough to stay cache-resident through
+# the noise-add-clip-cast pipeline instead of streaming the full frame
+# through DRAM three times.
+TILE_ROWS = 256
+
 
 def create_text_page(c, page_num, text_amount="normal"):
     """Add a text-only page."""
@@ -37,42 +46,147 @@ def create_text_page(c, page_num, text_amount="normal"):
     c.showPage()
 
 
-def create_image_page(c, page_num, size_multiplier=1):
-    """Add a page with a large uncompressed-style image."""
-    # Bigger images = bigger PDF
+def _image_dimensions(size_multiplier):
+    """Pixel dimensions for an image page. Bigger images = bigger PDF."""
     base_size = 1500
-    img_width = int(base_size * size_multiplier)
-    img_height = int(base_size * 0.75 * size_multiplier)
-
-    # Create complex image (harder to compress)
-    img = Image.new('RGB', (img_width, img_height))
-    pixels = img.load()
-
-    random.seed(page_num)  # Different but reproducible per page
-    for x in range(img_width):
-        for y in range(img_height):
-            # Add noise to make it less compressible
-            noise = random.randint(-30, 30)
-            r = (int((x / img_width) * 200) + noise) % 256
-            g = (int((y / img_height) * 200) + noise) % 256
-            b = (int(((x * y) / (img_width * img_height)) * 200) + noise) % 256
-            pixels[x, y] = (max(0, min(255, r)), max(0, min(255, g)), max(0, min(255, b)))
+    return int(base_size * size_multiplier), int(base_size * 0.75 * size_multiplier)
+
+
+# The gradient planes depend only on the image dimensions, so compute them
+# once per (width, height) and reuse across pages (per process).
+_GRADIENT_CACHE = {}
+
+# Compiled noise kernel; None = not built yet, False = numba unavailable
+_NUMBA_FILL = None
+
+
+def _numba_fill():
+    """Return the JIT-compiled noise+gradient kernel, or None without numba.
+
+    The kernel fills rows in parallel with a per-row LCG, so its noise
+    stream differs from the numpy path's, but it is just as deterministic
+    per page.
+    """
+    global _NUMBA_FILL
+    if _NUMBA_FILL is False:
+        return None
+    if _NUMBA_FILL is None:
+        try:
+            import numba
+        except ImportError:
+            _NUMBA_FILL = False
+            return None
+
+        @numba.njit(parallel=True, cache=True)
+        def _fill(out, seed, width, height):
+            for y in numba.prange(height):
+                state = seed * 2654435761 + y + 1
+                for x in range(width):
+                    gr = x * 200 // width
+                    gg = y * 200 // height
+                    gb = x * y * 200 // (width * height)
+
+                    state = state * 6364136223846793005 + 1442695040888963407
+                    v = gr + ((state >> 33) & 0x7FFFFFFF) % 61 - 30
+                    out[y, x, 0] = 0 if v < 0 else (255 if v > 255 else v)
+
+                    state = state * 6364136223846793005 + 1442695040888963407
+                    v = gg + ((state >> 33) & 0x7FFFFFFF) % 61 - 30
+                    out[y, x, 1] = 0 if v < 0 else (255 if v > 255 else v)
+
+                    state = state * 6364136223846793005 + 1442695040888963407
+                    v = gb + ((state >> 33) & 0x7FFFFFFF) % 61 - 30
+                    out[y, x, 2] = 0 if v < 0 else (255 if v > 255 else v)
+
+        _NUMBA_FILL = _fill
+    return _NUMBA_FILL
+
+
+def _gradient_stack(img_width, img_height):
+    """Return the cached HxWx3 int16 gradient for the given dimensions."""
+    import numpy as np
+
+    key = (img_width, img_height)
+    grad = _GRADIENT_CACHE.get(key)
+    if grad is None:
+        xs = np.arange(img_width)
+        ys = np.arange(img_height)
+        grad = np.empty((img_height, img_width, 3), dtype=np.int16)
+        grad[..., 0] = xs[None, :] * 200 // img_width
+        grad[..., 1] = ys[:, None] * 200 // img_height
+        grad[..., 2] = xs[None, :] * ys[:, None] * 200 // (img_width * img_height)
+        _GRADIENT_CACHE[key] = grad
+    return grad
+
+
+def _build_png_bytes(page_num, size_multiplier=1):
+    """Build the noisy-gradient PNG for an image page and return its bytes.
+
+    CPU-bound and self-contained, so it can run in a worker process.
+    """
+    import numpy as np
+    from PIL import Image
+
+    img_width, img_height = _image_dimensions(size_multiplier)
+
+    fill = _numba_fill()
+    if fill is not None:
+        # JIT kernel: gradient + noise + clamp fused in one threaded pass
+        arr = np.empty((img_height, img_width, 3), dtype=np.uint8)
+        fill(arr, page_num, img_width, img_height)
+    else:
+        # Create complex image (harder to compress), vectorized and tiled
+        # in TILE_ROWS strips so each strip's noise-add-clip-cast pipeline
+        # stays in cache. The per-strip draws don't reproduce a single
+        # full-frame draw bit for bit (the generator buffers random bits
+        # per integers() call), but the seed still makes every page fully
+        # deterministic, which is all the fixtures need.
+        grad = _gradient_stack(img_width, img_height)
+        rng = np.random.default_rng(page_num)  # Different but reproducible per page
+        arr = np.empty((img_height, img_width, 3), dtype=np.uint8)
+        for y0 in range(0, img_height, TILE_ROWS):
+            y1 = min(y0 + TILE_ROWS, img_height)
+            strip = rng.integers(-30, 31, (y1 - y0, img_width, 3), dtype=np.int16)
+            strip += grad[y0:y1]
+            np.clip(strip, 0, 255, out=strip)
+            arr[y0:y1] = strip
+
+    # frombuffer's 'raw' decoder is a single memcpy from the contiguous
+    # array into Pillow's image storage - no per-pixel dispatch at all.
+    img = Image.frombuffer('RGB', (img_width, img_height), arr, 'raw', 'RGB', 0, 1)
 
     # Save as PNG (lossless)
     buffer = BytesIO()
-    img.save(buffer, format='PNG')
-    buffer.seek(0)
+    img.save(buffer, format='PNG', compress_level=TEST_PNG_COMPRESS_LEVEL)
+    return buffer.getvalue()
+
+
+def create_image_page(c, page_num, size_multiplier=1, png_bytes=None):
+    """Add a page with a large uncompressed-style image.
+
+    Pass png_bytes to draw an image that was pre-built elsewhere (e.g. in a
+    worker process); otherwise the PNG is built inline.
+    """
+    from reportlab.lib.utils import ImageReader
+
+    img_width, img_height = _image_dimensions(size_multiplier)
+
+    if png_bytes is None:
+        png_bytes = _build_png_bytes(page_num, size_multiplier)
 
     c.setFont("Helvetica-Bold", 14)
     c.drawString(40, 770, f"Page {page_num} - Image ({img_width}x{img_height})")
 
-    img_reader = ImageReader(buffer)
+    img_reader = ImageReader(BytesIO(png_bytes))
     c.drawImage(img_reader, 40, 100, width=530, height=400)
     c.showPage()
 
 
 def create_test_10mb():
     """Create ~10MB PDF with mixed content."""
+    from reportlab.lib.pagesizes import letter
+    from reportlab.pdfgen import canvas
+
     print("Creating: test_10mb.pdf (~10MB target, mixed content)")
     path = os.path.join(OUTPUT_DIR, "test_10mb.pdf")
     c = canvas.Canvas(path, pagesize=letter)
@@ -92,15 +206,25 @@ def create_test_10mb():
 
 def create_test_25mb():
     """Create ~25MB PDF with mostly images."""
+    from reportlab.lib.pagesizes import letter
+    from reportlab.pdfgen import canvas
+
     print("Creating: test_25mb.pdf (~25MB target, image-heavy)")
     path = os.path.join(OUTPUT_DIR, "test_25mb.pdf")
     c = canvas.Canvas(path, pagesize=letter)
 
+    # Build the heavy PNGs in worker processes; the Canvas itself is not
+    # thread-safe, so all drawing stays on the main thread.
+    image_pages = [i + 1 for i in range(80) if i % 3 != 0]
+    with ProcessPoolExecutor() as executor:
+        pngs = dict(zip(image_pages, executor.map(
+            _build_png_bytes, image_pages, [1.2] * len(image_pages), chunksize=4)))
+
     for i in range(80):
         if i % 3 == 0:
             create_text_page(c, i + 1, "normal")
         else:
-            create_image_page(c, i + 1, size_multiplier=1.2)
+            create_image_page(c, i + 1, size_multiplier=1.2, png_bytes=pngs[i + 1])
 
     c.save()
     size_mb = os.path.getsize(path) / (1024 * 1024)
@@ -110,6 +234,9 @@ def create_test_25mb():
 
 def create_test_variable():
     """Create PDF with highly variable page sizes."""
+    from reportlab.lib.pagesizes import letter
+    from reportlab.pdfgen import canvas
+
     print("Creating: test_variable.pdf (variable page sizes)")
     path = os.path.join(OUTPUT_DIR, "test_variable.pdf")
     c = canvas.Canvas(path, pagesize=letter)
@@ -136,25 +263,24 @@ def create_test_variable():
 
 def create_test_one_giant():
     """Create PDF where one page is much larger than others."""
+    import numpy as np
+    from PIL import Image
+    from reportlab.lib.pagesizes import letter
+    from reportlab.lib.utils import ImageReader
+    from reportlab.pdfgen import canvas
+
     print("Creating: test_one_giant.pdf (1 huge page + 29 tiny)")
     path = os.path.join(OUTPUT_DIR, "test_one_giant.pdf")
     c = canvas.Canvas(path, pagesize=letter)
 
-    # Page 1: Giant 4K-ish noisy image
+    # Page 1: Giant 4K-ish noisy image, drawn in a single vectorized RNG call
     img_width, img_height = 3000, 2000
-    img = Image.new('RGB', (img_width, img_height))
-    pixels = img.load()
-    random.seed(999)
-    for x in range(img_width):
-        for y in range(img_height):
-            pixels[x, y] = (
-                random.randint(0, 255),
-                random.randint(0, 255),
-                random.randint(0, 255)
-            )
+    arr = np.random.default_rng(999).integers(
+        0, 256, (img_height, img_width, 3), dtype=np.uint8)
+    img = Image.frombuffer('RGB', (img_width, img_height), arr, 'raw', 'RGB', 0, 1)
 
     buffer = BytesIO()
-    img.save(buffer, format='PNG')
+    img.save(buffer, format='PNG', compress_level=TEST_PNG_COMPRESS_LEVEL)
     buffer.seek(0)
 
     c.setFont("Helvetica-Bold", 16)
@@ -174,13 +300,28 @@ def create_test_one_giant():
 
 
 def create_test_uniform():
-    """Create PDF with uniform page sizes."""
+    """Create PDF with uniform page sizes.
+
+    Every page draws the same pre-built image, so reportlab emits a single
+    shared /XObject referenced 100 times: the pages are genuinely uniform
+    and generation costs one PNG encode instead of 100.
+    """
+    from reportlab.lib.pagesizes import letter
+    from reportlab.lib.utils import ImageReader
+    from reportlab.pdfgen import canvas
+
     print("Creating: test_uniform.pdf (all pages same size)")
     path = os.path.join(OUTPUT_DIR, "test_uniform.pdf")
     c = canvas.Canvas(path, pagesize=letter)
 
+    img_width, img_height = _image_dimensions(0.8)
+    shared_image = ImageReader(BytesIO(_build_png_bytes(0, 0.8)))
+
     for i in range(100):
-        create_image_page(c, i + 1, size_multiplier=0.8)
+        c.setFont("Helvetica-Bold", 14)
+        c.drawString(40, 770, f"Page {i + 1} - Image ({img_width}x{img_height})")
+        c.drawImage(shared_image, 40, 100, width=530, height=400)
+        c.showPage()
 
     c.save()
     size_mb = os.path.getsize(path) / (1024 * 1024)
@@ -188,6 +329,11 @@ def create_test_uniform():
     return path
 
 
+def _run_builder(builder):
+    """Top-level trampoline so builders can be dispatched to worker processes."""
+    return builder()
+
+
 def main():
     os.makedirs(OUTPUT_DIR, exist_ok=True)
 
@@ -196,11 +342,17 @@ def main():
     print("=" * 60)
     print()
 
-    create_test_10mb()
-    create_test_25mb()
-    create_test_variable()
-    create_test_one_giant()
-    create_test_uniform()
+    # Each builder is an independent CPU-bound job (PNG encoding of noise),
+    # so run them on separate cores. Every worker owns its own Canvas.
+    builders = [
+        create_test_10mb,
+        create_test_25mb,
+        create_test_variable,
+        create_test_one_giant,
+        create_test_uniform,
+    ]
+    with ProcessPoolExecutor(max_workers=min(len(builders), os.cpu_count() or 1)) as executor:
+        list(executor.map(_run_builder, builders))
 
     print()
     print("=" * 60)
@@ -212,12 +364,15 @@ def main():
     print("Test Cases:")
     print("-" * 60)
     total = 0
-    for f in sorted(os.listdir(OUTPUT_DIR)):
-        if f.endswith('.pdf'):
-            path = os.path.join(OUTPUT_DIR, f)
-            size = os.path.getsize(path)
-            total += size
-            print(f"  {f:30} {size / (1024*1024):>8.2f} MB")
+    # scandir caches stat results on the DirEntry: one syscall per file
+    # instead of a listdir plus a separate stat round trip.
+    with os.scandir(OUTPUT_DIR) as it:
+        entries = sorted((e for e in it if e.name.endswith('.pdf')),
+                         key=lambda e: e.name)
+    for entry in entries:
+        size = entry.stat().st_size
+        total += size
+        print(f"  {entry.name:30} {size / (1024*1024):>8.2f} MB")
     print("-" * 60)
     print(f"  {'Total':30} {total / (1024*1024):>8.2f} MB")
     print()